@@ -1,17 +1,28 @@
 """Setup file for the HNL rules plugin."""
 
+import os
+
 from setuptools import find_packages, setup
 
 # Change these names in your plugin, e.g. company name or plugin purpose.
 PLUGIN_LOGICAL_NAME = "hnl"
 PLUGIN_ROOT_MODULE = "sqlfluff_plugin_hnl"
 
+# Optionally compile the rules to a C extension with mypyc, which speeds up
+# linting. Opt in with `HNL_USE_MYPYC=1 pip install .`.
+ext_modules = []
+if os.environ.get("HNL_USE_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify([f"src/{PLUGIN_ROOT_MODULE}/rules.py"])
+
 setup(
     name=f"sqlfluff-plugin-{PLUGIN_LOGICAL_NAME}",
     version="1.0.0",
     include_package_data=True,
     package_dir={"": "src"},
     packages=find_packages(where="src"),
+    ext_modules=ext_modules,
     install_requires="sqlfluff>=0.4.0",
     entry_points={
         "sqlfluff": [f"sqlfluff_{PLUGIN_LOGICAL_NAME} = {PLUGIN_ROOT_MODULE}"]
@@ -3,12 +3,22 @@
 This uses the rules API supported from 0.4.0 onwards.
 """
 
-from typing import List, Type
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any, Dict, List, Type
 
 from sqlfluff.core.config import ConfigLoader
 from sqlfluff.core.plugin import hookimpl
 from sqlfluff.core.rules import BaseRule
 
+CONFIGS_INFO_DICT: Dict[str, Any] = {
+    "alias_usage_style": {
+        "validation": ["always", "consistent_file", "consisent_clause"],
+        "definition": "The alias usage style to enforce.",
+    }
+}
+
+
 @hookimpl
 def get_rules() -> List[Type[BaseRule]]:
     """Get plugin rules."""
@@ -18,9 +28,9 @@ def get_rules() -> List[Type[BaseRule]]:
     return [Rule_HNL_A001, Rule_HNL_A002]
 
 
-@hookimpl
-def load_default_config() -> dict:
-    """Loads the default configuration for the plugin."""
+@lru_cache(maxsize=1)
+def _default_config() -> Dict[str, Any]:
+    """Read the plugin default configuration resource, once per process."""
     return ConfigLoader.get_global().load_config_resource(
         package="sqlfluff_plugin_hnl",
         file_name="plugin_default_config.cfg",
@@ -28,11 +38,13 @@ def load_default_config() -> dict:
 
 
 @hookimpl
-def get_configs_info() -> dict:
+def load_default_config() -> Dict[str, Any]:
+    """Loads the default configuration for the plugin."""
+    # Copy, so that callers cannot modify the cached configuration
+    return deepcopy(_default_config())
+
+
+@hookimpl
+def get_configs_info() -> Dict[str, Any]:
     """Get rule config validations and descriptions."""
-    return {
-        "alias_usage_style": {
-            "validation": ["always", "consistent_file", "consisent_clause"],
-            "definition": "The alias usage style to enforce.",
-        }
-    }
+    return CONFIGS_INFO_DICT
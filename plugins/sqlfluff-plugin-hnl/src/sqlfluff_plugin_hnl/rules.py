@@ -2,6 +2,9 @@
 
 This uses the rules API supported from 0.4.0 onwards.
 """
+from functools import lru_cache
+from typing import List, Optional, Set, Tuple
+
 from sqlfluff.core.rules import (
     BaseRule,
     LintResult,
@@ -11,9 +14,10 @@ from sqlfluff.core.rules import (
 from sqlfluff.core.rules.base import EvalResultType
 from sqlfluff.core.rules.context import RuleContext
 from sqlfluff.core.rules.crawlers import SegmentSeekerCrawler
-from sqlfluff.utils.functional import FunctionalContext, Segments, sp
-from sqlfluff.core.parser import KeywordSegment, WhitespaceSegment
-from sqlfluff.utils.reflow import ReflowSequence
+from sqlfluff.core.parser import BaseSegment, KeywordSegment, WhitespaceSegment
+
+# Comments that exclude the columns on their line from the HNL_A002 ordering check
+_NOQA_RAWS = frozenset(("-- noqa", "-- noqa: HNL_A002"))
 
 
 class Rule_HNL_A001(BaseRule):
@@ -84,6 +88,11 @@ class Rule_HNL_A001(BaseRule):
     config_keywords = ["alias_usage_style"]
     is_fix_compatible = True
 
+    _USAGE_STYLES = {
+        "consistent_file": "file",
+        "consistent_clause": "clause",
+    }
+
     def _eval(self, context: RuleContext) -> EvalResultType:
         """
         Find columns that, depending on the configuration,
@@ -104,8 +113,7 @@ class Rule_HNL_A001(BaseRule):
         assert context.segment.is_type("select_clause")
 
         self.alias_usage_style: str
-        violations = []
-        children: Segments = FunctionalContext(context).segment.children()
+        violations: List[LintResult] = []
 
         # Use memory to store decuded alias usage for when usage should be cosistent in entire file
         memory = context.memory
@@ -115,23 +123,36 @@ class Rule_HNL_A001(BaseRule):
         elif(self.alias_usage_style == "always"):
             alias_usage = "yes"
 
-        for clause_element in children.select(sp.is_type("select_clause_element")):
+        # Determine the description based on alias_usage_style
+        if self.alias_usage_style in self._USAGE_STYLES:
+            usage_style = self._USAGE_STYLES[self.alias_usage_style]
+            description = f"Column alias usage should be consistent within {usage_style}."
+        elif self.alias_usage_style == "always":
+            description = "Column should always use an alias."
+
+        # Whether columns should have an alias, if already known
+        want_alias = None if alias_usage is None else alias_usage == "yes"
+
+        for clause_element in context.segment.segments:
+            if clause_element.type != "select_clause_element":
+                continue
+
             # Get alias of select clause element, if it exists
             alias_expression = clause_element.get_child("alias_expression")  # `as col_a`
 
+            has_alias = alias_expression is not None
+
             # Set the deduced alias usage based on whether the first occurrence in the select clause has an alias
-            if not alias_usage:
-                alias_usage = (
-                    "yes" if alias_expression else "no"
-                )
-                memory["alias_usage"] = alias_usage
+            if want_alias is None:
+                want_alias = has_alias
+                memory["alias_usage"] = "yes" if has_alias else "no"
 
             # When column does not deviate from expected alias usage go to next column in select clause
-            if alias_usage == "yes" and alias_expression or alias_usage == "no" and not alias_expression: 
+            if has_alias == want_alias:
                 continue
 
             # Continue when we have a deviation from the expected alias usage
-            fixes = []
+            fixes: List[LintFix] = []
   
             # Get referenced column for simple columns, if it exists
             column_reference = clause_element.get_child("column_reference")
@@ -139,57 +160,38 @@ class Rule_HNL_A001(BaseRule):
             # We can only add an alias to simple columns. For these, we will use
             # the name of the referenced column as the alias (self-alias).
             # For complex or expression columns, the user must decide the alias.
-            if(alias_usage == "yes" and column_reference):
+            if want_alias and column_reference:
+                column_identifier = _column_identifier(column_reference)
+
                 # If column has either a naked_identifier or quoted_identifier
                 # (not positional identifier like $n in snowflake)
                 # then continue
-                if column_reference.get_child("naked_identifier") or column_reference.get_child(
-                    "quoted_identifier"
-                ):            
-                    # If the column name is quoted then get the `quoted_identifier`,
-                    # otherwise get the last `naked_identifier`.
-                    # The last naked_identifier in column_reference type
-                    # belongs to the column name.
-                    # Example: a.col_name where `a` is table name/alias identifier
-                    if column_reference.get_child("quoted_identifier"):
-                        column_identifier = column_reference.get_child("quoted_identifier")
-                    else:
-                        column_identifier = column_reference.get_children("naked_identifier")[-1]     
-
+                if column_identifier:
                     fixes = [
                         LintFix.create_after(
                             column_reference,
                             [WhitespaceSegment(), KeywordSegment("AS"), WhitespaceSegment(), column_identifier],
                         )
                     ]
-            elif(alias_usage == "no"):
-                if alias_expression:
-                    fixes = [
-                        LintFix.delete(
-                            alias_expression
-                        )
-                    ]                
-
-            usage_styles = {
-                "consistent_file": "file",
-                "consistent_clause": "clause"
-            }
-
-            # Determine the description based on alias_usage_style
-            if self.alias_usage_style in usage_styles:
-                usage_style = usage_styles[self.alias_usage_style]
-                description = f"Column alias usage should be consistent within {usage_style}."
-            elif self.alias_usage_style == "always":
-                description = "Column should always use an alias."
+            elif not want_alias and alias_expression:
+                fixes = [
+                    LintFix.delete(
+                        alias_expression
+                    )
+                ]
 
             violations.append(
                 LintResult(
                     anchor=clause_element,
                     description=description,
                     fixes=fixes,
-                    memory=memory,
                 )
-            )   
+            )
+
+        # The crawler only takes memory from the last result, so only that
+        # one needs to carry it
+        if violations:
+            violations[-1].memory = memory
 
         return violations or None
 class Rule_HNL_A002(BaseRule):
@@ -265,67 +267,120 @@ class Rule_HNL_A002(BaseRule):
         """
         assert context.segment.is_type("select_clause")       
 
-        identifiers = []
-        violations = []
-        children: Segments = FunctionalContext(context).segment.children()
-
-        # Get lines that contain a comment that explicitly exclude columns
-        # on that line from the ordering scheme check
-        # We take all comments from the parent since a comment at the end
-        # of a SELECT clause is apparently part of the parent segement
-        line_positions_to_ignore = []
-        comments = context.segment.get_parent()[0].recursive_crawl("comment")
-        for comment in comments:
-            if comment.raw in ("-- noqa", "-- noqa: HNL_A002"):
-                line_positions_to_ignore.append(comment.get_start_loc()[0])
-
-        for clause_element in children.select(sp.is_type("select_clause_element")):
+        clause_elements = [
+            segment
+            for segment in context.segment.segments
+            if segment.type == "select_clause_element"
+        ]
+
+        # A single column can not be out of order
+        if len(clause_elements) < 2:
+            return None
+
+        # The identifiers of the columns and their elements, as parallel lists
+        raw_identifiers: List[str] = []
+        elements: List[BaseSegment] = []
+
+        # Get comments that explicitly exclude columns on their line from
+        # the ordering scheme check. These are collected from the whole file
+        # once and kept in memory for the other select clauses.
+        # NOTE: Any non-empty return must set this memory on its last result,
+        # otherwise the crawler passes `None` as memory to the next clause.
+        memory = context.memory
+        noqa_comments: Optional[List[BaseSegment]] = memory.get("noqa_comments")
+        if noqa_comments is None:
+            noqa_comments = [
+                comment
+                for comment in context.parent_stack[0].recursive_crawl("comment")
+                if comment.raw in _NOQA_RAWS
+            ]
+            memory["noqa_comments"] = noqa_comments
+
+        # Get lines of the comments within the parent, since a comment at the
+        # end of a SELECT clause is apparently part of the parent segement
+        parent = context.segment.get_parent()
+        assert parent and parent[0].pos_marker
+        parent_slice = parent[0].pos_marker.templated_slice
+        line_positions_to_ignore: Set[int] = set()
+        for comment in noqa_comments:
+            assert comment.pos_marker
+            comment_slice = comment.pos_marker.templated_slice
+            if (
+                parent_slice.start <= comment_slice.start
+                and comment_slice.stop <= parent_slice.stop
+            ):
+                line_positions_to_ignore.add(comment.get_start_loc()[0])
+
+        for clause_element in clause_elements:
             # Get alias of select clause element, if it exists
             column = clause_element.get_child("column_reference")  # `col_a`
             alias_expression = clause_element.get_child("alias_expression")  # `as col_a`
 
-            identifier = None
+            identifier: Optional[BaseSegment] = None
             if alias_expression:
                 identifier = alias_expression.get_child(
                     "naked_identifier"
                 ) or alias_expression.get_child("quoted_identifier")                
             elif column:
-                if column.get_child("naked_identifier") or column.get_child(
-                    "quoted_identifier"
-                ):                
-                    if column.get_child("quoted_identifier"):
-                        identifier = column.get_child("quoted_identifier")
-                    else:
-                        identifier = column.get_children("naked_identifier")[-1]
+                identifier = _column_identifier(column)
 
             if not identifier:
                 continue
 
-            identifier = identifier.raw.strip("\"'`[]")
+            raw_identifier = identifier.raw.strip("\"'`[]")
 
             # Only add identifiers that are not on a line that contains a `noqa` directive
             if clause_element.get_start_loc()[0] not in line_positions_to_ignore:
-                identifiers.append((identifier, clause_element))
+                raw_identifiers.append(raw_identifier)
+                elements.append(clause_element)
 
-        # Sorting the list based on our ordering scheme
-        sorted_identifiers = sorted(identifiers, key=custom_sort_key)
+        # Compute the sort key of every column once, so it is not recomputed
+        # by each comparison during sorting
+        keys = [custom_sort_key(raw) for raw in raw_identifiers]
 
-        # Find elements that have changed their position
-        changed_identifiers = [original for original, sorted_ in zip(identifiers, sorted_identifiers) if original != sorted_]
+        # Nothing to report when the columns already follow the ordering scheme
+        if all(keys[i] <= keys[i + 1] for i in range(len(keys) - 1)):
+            return None
 
-        for _, clause_element in changed_identifiers:
-            violations.append(
-                LintResult(
-                    anchor=clause_element,
-                    description=f"Column should be ordered based on ordering scheme.",
-                )
+        # Sorting the column positions based on our ordering scheme
+        sorted_indices = sorted(range(len(keys)), key=keys.__getitem__)
+
+        # Flag elements that have changed their position
+        violations = [
+            LintResult(
+                anchor=elements[i],
+                description="Column should be ordered based on ordering scheme.",
             )
+            for i, sorted_index in enumerate(sorted_indices)
+            if i != sorted_index
+        ]
+
+        # The crawler only takes memory from the last result
+        violations[-1].memory = memory
 
         return violations
 
-def custom_sort_key(item):
-    raw_string, _ = item
+def _column_identifier(column_reference: BaseSegment) -> Optional[BaseSegment]:
+    """Get the identifier of the column name in a column reference.
+
+    If the column name is quoted then this is the `quoted_identifier`,
+    otherwise the last `naked_identifier`, which belongs to the column
+    name. Example: a.col_name where `a` is table name/alias identifier.
+    Positional identifiers (like $n in snowflake) give `None`.
+    """
+    quoted_identifier = column_reference.get_child("quoted_identifier")
+    if quoted_identifier:
+        return quoted_identifier
+    naked_identifiers = column_reference.get_children("naked_identifier")
+    return naked_identifiers[-1] if naked_identifiers else None
 
+
+@lru_cache(maxsize=4096)
+def custom_sort_key(raw_string: str) -> Tuple[int, str]:
+    """Get the ordering scheme sort key of a column identifier.
+
+    Cached, as the same column names tend to recur across a file.
+    """
     # Define sort priority based on conditions
     if raw_string.startswith("BK"):
         priority = 0
@@ -338,4 +393,4 @@ def custom_sort_key(item):
     else:
         priority = 3
 
-    return (priority, raw_string.lower())        
\ No newline at end of file
+    return (priority, raw_string.lower())
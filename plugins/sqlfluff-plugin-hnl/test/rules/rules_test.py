@@ -0,0 +1,38 @@
+"""Tests for the HNL rules beyond the yaml test cases."""
+
+from sqlfluff.core import FluffConfig, Linter
+
+
+def test__rules__hnl_a001_fix_segments_unique():
+    """Each HNL_A001 fix inserts its own segments.
+
+    The linter applies fixes by anchor uuid, so segments shared between
+    fixes would make later fixes on them collide.
+    """
+    cfg = FluffConfig(overrides={"rules": "HNL_A001", "dialect": "ansi"})
+    linted = Linter(config=cfg).lint_string("select a, b, c from t\n")
+    edits = [
+        seg
+        for violation in linted.violations
+        for fix in violation.fixes
+        for seg in fix.edit or []
+    ]
+    assert len(edits) == 12
+    assert len({seg.uuid for seg in edits}) == len(edits)
+
+
+def test__rules__hnl_a001_fix_with_other_rules():
+    """HNL_A001 fixes apply alongside fixes that edit the inserted segments."""
+    cfg = FluffConfig(
+        configs={
+            "rules": {"capitalisation.keywords": {"capitalisation_policy": "lower"}}
+        },
+        overrides={"rules": "HNL_A001,CP01", "dialect": "ansi"},
+    )
+    columns = [f"c{i}" for i in range(15)]
+    sql = f"select {', '.join(columns)} from t\n"
+    linted = Linter(config=cfg).lint_string(sql, fix=True)
+    fixed, _ = linted.fix_string()
+    assert fixed == (
+        f"select {', '.join(f'{col} as {col}' for col in columns)} from t\n"
+    )